@@ -1,24 +1,32 @@
 # Description: Contains a Hash map ADT that uses a dynamic array and Hash entry class as the underlying data structures.
-#              Implements Open Addressing with Quadratic Probing for collision resolution inside that dynamic array.
+#              Implements Open Addressing with Robin Hood Linear Probing for collision resolution inside that dynamic
+#              array, and removes entries by backward shifting instead of leaving tombstones.
 
-from underlying-data-structures import (DynamicArray, DynamicArrayException, HashEntry,
+from underlying-data-structures import (DynamicArray, HashEntry,
                         hash_function_1, hash_function_2)
 
+# Marks the hash memo as holding no key yet; a private object no caller can pass, so every real key is hashed
+_NO_KEY = object()
+
 
 class HashMap:
     def __init__(self, capacity: int, function) -> None:
         """
         Initialize new HashMap that uses
-        quadratic probing for collision resolution
+        Robin Hood linear probing for collision resolution
         """
         self._buckets = DynamicArray()
 
-        # capacity must be a prime number
-        self._capacity = self._next_prime(capacity)
+        # capacity must be a power of two so bucket indices can be masked instead of taken modulo
+        self._capacity = self._next_power_of_two(capacity)
+        self._mask = self._capacity - 1
         for _ in range(self._capacity):
             self._buckets.append(None)
 
         self._hash_function = function
+        # Last key hashed and its hash, so back-to-back operations on one key (such as a get then a put) hash it once
+        self._last_key = _NO_KEY
+        self._last_hash = 0
         self._size = 0
 
     def __str__(self) -> str:
@@ -30,36 +38,36 @@ class HashMap:
             out += str(i) + ': ' + str(self._buckets[i]) + '\n'
         return out
 
-    def _next_prime(self, capacity: int) -> int:
+    @staticmethod
+    def _next_power_of_two(capacity: int) -> int:
         """
-        Increment from given number to find the closest prime number
+        Double from one to find the closest power of two that is at least the given number
         """
-        if capacity % 2 == 0:
-            capacity += 1
+        power = 1
+        while power < capacity:
+            power <<= 1
+        return power
 
-        while not self._is_prime(capacity):
-            capacity += 2
-
-        return capacity
+    def _hash(self, key: str) -> int:
+        """
+        Return the mixed hash of the given key, reusing the previous result when the same key is hashed again
+        """
+        if key != self._last_key:
+            # Hashes first, so a key the hash function rejects never enters the memo
+            hash = self._mix(self._hash_function(key))
+            self._last_key = key
+            self._last_hash = hash
+        return self._last_hash
 
     @staticmethod
-    def _is_prime(capacity: int) -> bool:
+    def _mix(hash: int) -> int:
         """
-        Determine if given integer is a prime number and return boolean
+        Scramble a hash by Fibonacci multiplication, folding the high bits into the low bits that the mask keeps.
+        Keys with nearby hashes (common with the sample hash functions) would otherwise crowd into neighbouring
+        buckets, where their probe sequences keep running into one another
         """
-        if capacity == 2 or capacity == 3:
-            return True
-
-        if capacity == 1 or capacity % 2 == 0:
-            return False
-
-        factor = 3
-        while factor ** 2 <= capacity:
-            if capacity % factor == 0:
-                return False
-            factor += 2
-
-        return True
+        hash = (hash * 11400714819323198485) & 0xFFFFFFFFFFFFFFFF
+        return hash ^ (hash >> 32)
 
     def get_size(self) -> int:
         """
@@ -82,27 +90,75 @@ class HashMap:
 
         :return: none
         """
-        # Doubles current capacity when current load factor is greater than or equal to 0.5
-        if self.table_load() >= 0.5:
-            self.resize_table(self._next_prime(self._capacity * 2))
-
-        # Uses quadratic probing to find appropriate spot
-        index = self._hash_function(key) % self._capacity
-        initial_index = index
-        probe = 0
-        while probe < self._capacity:
-            # Adds a new key/value pair if spot is empty or a tombstone and updates size
-            if self._buckets[index] is None or self._buckets[index].is_tombstone:
-                self._buckets[index] = HashEntry(key, value)
-                self._buckets[index].is_tombstone = False
-                self._size += 1
-                return
+        # Doubles current capacity when current load factor is greater than or equal to 0.75
+        if self.table_load() >= 0.75:
+            self.resize_table(self._capacity * 2)
+
+        self._insert(key, value)
+
+    def put_many(self, items: DynamicArray) -> None:
+        """
+        Updates the hash map with every key/value pair in the given dynamic array. Grows the hash table exactly where
+        the same sequence of put calls would, but only re-checks the load factor after a new key is added.
+
+        :param items: dynamic array of tuples of key/value pairs, in the form returned by get_keys_and_values
+
+        :return: none
+        """
+        # Tracks whether the load factor has reached 0.75, the point at which put would double the capacity
+        # before its next update; updates to existing keys leave the load unchanged
+        full = self._size * 4 >= self._capacity * 3
+        for pair in range(items.length()):
+            key, value = items[pair]
+            if full:
+                self.resize_table(self._capacity * 2)
+                full = self._size * 4 >= self._capacity * 3
+            if self._insert(key, value):
+                full = self._size * 4 >= self._capacity * 3
+
+    def _insert(self, key: str, value: object) -> bool:
+        """
+        Update the key/value pair in the hash map, assuming the table already has room for a new key.
+        Return True if the key was added, or False if an existing key's value was replaced
+        """
+        # Uses linear probing to search for the key, or for the first bucket its new entry may claim
+        buckets = self._buckets
+        mask = self._mask
+        hash = self._hash(key)
+        index = hash & mask
+        distance = 0
+        entry = buckets[index]
+        while entry is not None and entry.distance >= distance:
             # Replaces associated value if key exists
-            if self._buckets[index].key == key:
-                self._buckets[index].value = value
-                return
-            probe += 1
-            index = (initial_index + probe ** 2) % self._capacity
+            if entry.hash == hash and entry.key == key:
+                entry.value = value
+                return False
+            distance += 1
+            index = (index + 1) & mask
+            entry = buckets[index]
+
+        # Adds a new key/value pair and updates size
+        self._place(HashEntry(key, value, hash, distance), index)
+        self._size += 1
+        return True
+
+    def _place(self, carried: HashEntry, index: int) -> None:
+        """
+        Place an entry whose key is not in the hash map, starting at the given bucket with the entry's distance from
+        its home already set. Displaces any entry closer to its home bucket than the carried entry and carries that
+        one on (Robin Hood).
+        """
+        buckets = self._buckets
+        mask = self._mask
+        entry = buckets[index]
+        while entry is not None:
+            if entry.distance < carried.distance:
+                buckets[index] = carried
+                carried = entry
+            carried.distance += 1
+            index = (index + 1) & mask
+            entry = buckets[index]
+        buckets[index] = carried
 
     def table_load(self) -> float:
         """
@@ -119,17 +175,13 @@ class HashMap:
 
         :return: integer of empty buckets
         """
-        # Counts how many empty buckets are in the hash table and returns that count
-        count = 0
-        for index in range(self._capacity):
-            if self._buckets[index] is None or self._buckets[index].is_tombstone:
-                count += 1
-        return count
+        # Without tombstones every bucket not holding an entry is empty, so the count follows from the size
+        return self._capacity - self._size
 
     def resize_table(self, new_capacity: int) -> None:
         """
         Changes the capacity of the internal hash table. All existing key/value pairs must remain in the new hash map,
-        and all hash table links are rehashed.
+        and all hash table links are rebuilt from each entry's stored hash.
 
         :param new_capacity: integer of capacity to be resized to
 
@@ -139,23 +191,48 @@ class HashMap:
         if new_capacity < self._size:
             return
 
-        # Checks if given capacity is prime and finds the closest prime number if not
-        if not self._is_prime(new_capacity):
-            new_capacity = self._next_prime(new_capacity)
+        # Checks if given capacity is a power of two (a single bit set) and rounds it up to the closest one if not,
+        # so the doubling done by put never searches for a capacity. Also grows a capacity that would leave no
+        # empty bucket, since an empty bucket is what ends every probe
+        if new_capacity <= self._size or new_capacity & (new_capacity - 1):
+            new_capacity = self._next_power_of_two(new_capacity + 1)
 
-        # Gets the key/value pairs and clears the internal buckets
-        key_value_da = self.get_keys_and_values()
-        self.clear()
-        # Removes all buckets and adds the new correct amount of buckets
+        # Keeps the old buckets to move their entries from, and adds the new correct amount of buckets
+        old_buckets = self._buckets
+        old_capacity = self._capacity
         self._buckets = DynamicArray()
         for space in range(new_capacity):
             self._buckets.append(None)
 
-        # Updates the capacity and rehashes existing key/value pairs in the hash map based on the new capacity
+        # Updates the capacity and moves each existing entry straight into the new buckets, starting again from its
+        # home bucket, without collecting the key/value pairs first or looking up keys already known to be distinct.
+        # Entries are placed by their stored hash, so no key is hashed again
         self._capacity = new_capacity
-        for pair in range(key_value_da.length()):
-            key, value = key_value_da[pair]
-            self.put(key, value)
+        self._mask = new_capacity - 1
+        for index in range(old_capacity):
+            entry = old_buckets[index]
+            if entry is not None:
+                entry.distance = 0
+                self._place(entry, entry.hash & self._mask)
+
+    def _find_index(self, key: str) -> int:
+        """
+        Search for the given key using linear probing and return the index of its bucket, or -1 if not found.
+        Stops early at an entry closer to its home bucket than the key would be (or at an empty bucket).
+        """
+        buckets = self._buckets
+        mask = self._mask
+        hash = self._hash(key)
+        index = hash & mask
+        distance = 0
+        entry = buckets[index]
+        while entry is not None and entry.distance >= distance:
+            if entry.hash == hash and entry.key == key:
+                return index
+            distance += 1
+            index = (index + 1) & mask
+            entry = buckets[index]
+        return -1
 
     def get(self, key: str) -> object:
         """
@@ -165,18 +242,12 @@ class HashMap:
 
         :return: value associated with key
         """
-        # Searches for key in the hash map using quadratic probing and returns value for it if found
-        index = self._hash_function(key) % self._capacity
-        initial_index = index
-        probe = 0
-        while probe < self._capacity:
-            if self._buckets[index] is not None:
-                if not self._buckets[index].is_tombstone and self._buckets[index].key == key:
-                    return self._buckets[index].value
-            probe += 1
-            index = (initial_index + probe ** 2) % self._capacity
+        # Searches for key in the hash map and returns value for it if found
+        index = self._find_index(key)
         # Returns None if key is not in the hash map
-        return None
+        if index < 0:
+            return None
+        return self._buckets[index].value
 
     def contains_key(self, key: str) -> bool:
         """
@@ -186,17 +257,8 @@ class HashMap:
 
         :return: boolean of whether key was found
         """
-        # Searches for key in the hash map using quadratic probing and returns boolean for whether it is found
-        index = self._hash_function(key) % self._capacity
-        initial_index = index
-        probe = 0
-        while probe < self._capacity:
-            if self._buckets[index] is not None:
-                if self._buckets[index].key == key and not self._buckets[index].is_tombstone:
-                    return True
-            probe += 1
-            index = (initial_index + probe ** 2) % self._capacity
-        return False
+        # Searches for key in the hash map and returns boolean for whether it is found
+        return self._find_index(key) >= 0
 
     def remove(self, key: str) -> None:
         """
@@ -206,19 +268,24 @@ class HashMap:
 
         :return: none
         """
-        # Finds key to be removed using quadratic probing
-        index = self._hash_function(key) % self._capacity
-        initial_index = index
-        probe = 0
-        while probe < self._capacity:
-            if self._buckets[index] is not None:
-                # Updates tombstone status and hash map size if key is found and not a tombstone
-                if self._buckets[index].key == key and not self._buckets[index].is_tombstone:
-                    self._buckets[index].is_tombstone = True
-                    self._size -= 1
-                    return
-            probe += 1
-            index = (initial_index + probe ** 2) % self._capacity
+        # Finds key to be removed, does nothing if it is not in the hash map
+        index = self._find_index(key)
+        if index < 0:
+            return
+
+        # Shifts the following displaced entries back one bucket each instead of leaving a tombstone
+        buckets = self._buckets
+        mask = self._mask
+        next_index = (index + 1) & mask
+        next_entry = buckets[next_index]
+        while next_entry is not None and next_entry.distance > 0:
+            next_entry.distance -= 1
+            buckets[index] = next_entry
+            index = next_index
+            next_index = (index + 1) & mask
+            next_entry = buckets[next_index]
+        buckets[index] = None
+        self._size -= 1
 
     def clear(self) -> None:
         """
@@ -237,11 +304,18 @@ class HashMap:
 
         :return: dynamic array with tuples of key/value pairs
         """
-        # Creates a new dynamic array and adds each key/value pair in the hash map to it, then returns that array
+        # Creates a new dynamic array and adds each key/value pair in the hash map to it, then returns that array.
+        # Walks the buckets directly and stops once every entry is found instead of going through the iterator
         key_value_da = DynamicArray()
-        for element in self:
-            value = element.key, element.value
-            key_value_da.append(value)
+        buckets = self._buckets
+        remaining = self._size
+        index = 0
+        while remaining > 0:
+            entry = buckets[index]
+            if entry is not None:
+                key_value_da.append((entry.key, entry.value))
+                remaining -= 1
+            index += 1
         return key_value_da
 
     def __iter__(self):
@@ -249,22 +323,16 @@ class HashMap:
         Enables the hash map to iterate across itself. Returns self.
         """
         self._index = 0
-        while self._index < self._capacity and self._buckets[self._index] is None:
-            self._index += 1
         return self
 
     def __next__(self):
         """
         Obtain next active value and advance iterator.
         """
-        while self._index < self._capacity and (self._buckets[self._index] is None or
-                                                self._buckets[self._index].is_tombstone):
-            self._index += 1
-
-        try:
+        while self._index < self._capacity:
             current_entry = self._buckets[self._index]
             self._index += 1
-            return current_entry
-        except DynamicArrayException:
-            raise StopIteration
+            if current_entry is not None:
+                return current_entry
+        raise StopIteration
           
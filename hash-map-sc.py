@@ -1,10 +1,14 @@
 # Description: Contains a Hash map ADT that uses dynamic array and singly linked lists as underlying data structures.
+#              Linked lists are only created for buckets that hold at least one key.
 #              Contains a standalone find mode function using a hash map instance.
 
 
 from underlying-data-structures import (DynamicArray, LinkedList,
                         hash_function_1, hash_function_2)
 
+# Marks the hash memo as holding no key yet; a private object no caller can pass, so every real key is hashed
+_NO_KEY = object()
+
 
 class HashMap:
     def __init__(self,
@@ -14,14 +18,19 @@ class HashMap:
         Initialize new HashMap that uses
         separate chaining for collision resolution
         """
+        # Buckets hold None until a key hashes to them, so only buckets in use allocate a linked list
         self._buckets = DynamicArray()
 
-        # capacity must be a prime number
-        self._capacity = self._next_prime(capacity)
+        # capacity must be a power of two so bucket indices can be masked instead of taken modulo
+        self._capacity = self._next_power_of_two(capacity)
+        self._mask = self._capacity - 1
         for _ in range(self._capacity):
-            self._buckets.append(LinkedList())
+            self._buckets.append(None)
 
         self._hash_function = function
+        # Last key hashed and its hash, so back-to-back operations on one key (such as a get then a put) hash it once
+        self._last_key = _NO_KEY
+        self._last_hash = 0
         self._size = 0
 
     def __str__(self) -> str:
@@ -30,39 +39,30 @@ class HashMap:
         """
         out = ''
         for i in range(self._buckets.length()):
-            out += str(i) + ': ' + str(self._buckets[i]) + '\n'
+            linked_list = self._buckets[i]
+            out += str(i) + ': ' + (str(linked_list) if linked_list else 'SLL []') + '\n'
         return out
 
-    def _next_prime(self, capacity: int) -> int:
+    @staticmethod
+    def _next_power_of_two(capacity: int) -> int:
         """
-        Increment from given number and the find the closest prime number
+        Double from one to find the closest power of two that is at least the given number
         """
-        if capacity % 2 == 0:
-            capacity += 1
-
-        while not self._is_prime(capacity):
-            capacity += 2
+        power = 1
+        while power < capacity:
+            power <<= 1
+        return power
 
-        return capacity
-
-    @staticmethod
-    def _is_prime(capacity: int) -> bool:
+    def _hash(self, key: str) -> int:
         """
-        Determine if given integer is a prime number and return boolean
+        Return the hash of the given key, reusing the previous result when the same key is hashed again
         """
-        if capacity == 2 or capacity == 3:
-            return True
-
-        if capacity == 1 or capacity % 2 == 0:
-            return False
-
-        factor = 3
-        while factor ** 2 <= capacity:
-            if capacity % factor == 0:
-                return False
-            factor += 2
-
-        return True
+        if key != self._last_key:
+            # Hashes first, so a key the hash function rejects never enters the memo
+            hash = self._hash_function(key)
+            self._last_key = key
+            self._last_hash = hash
+        return self._last_hash
 
     def get_size(self) -> int:
         """
@@ -87,16 +87,54 @@ class HashMap:
         """
         # Doubles current capacity when current load factor is greater than or equal to 1.0
         if self.table_load() >= 1.0:
-            self.resize_table(self._next_prime(self._capacity * 2))
+            self.resize_table(self._capacity * 2)
 
-        # Replaces associated value if key exists, otherwise adds a new key/value pair
-        bucket = self._hash_function(key) % self._capacity
+        self._insert(key, value)
+
+    def put_many(self, items: DynamicArray) -> None:
+        """
+        Updates the hash map with every key/value pair in the given dynamic array. Grows the hash table exactly where
+        the same sequence of put calls would, but only re-checks the load factor after a new key is added.
+
+        :param items: dynamic array of tuples of key/value pairs, in the form returned by get_keys_and_values
+
+        :return: none
+        """
+        # Tracks whether the load factor has reached 1.0, the point at which put would double the capacity
+        # before its next update; updates to existing keys leave the load unchanged
+        full = self._size >= self._capacity
+        for pair in range(items.length()):
+            key, value = items[pair]
+            if full:
+                self.resize_table(self._capacity * 2)
+                full = self._size >= self._capacity
+            if self._insert(key, value):
+                full = self._size >= self._capacity
+
+    def _insert(self, key: str, value: object) -> bool:
+        """
+        Update the key/value pair in the hash map, assuming the table already has room for a new key.
+        Return True if the key was added, or False if an existing key's value was replaced
+        """
+        # Starts a linked list for the bucket if it is empty and adds a new key/value pair
+        hash = self._hash(key)
+        bucket = hash & self._mask
         linked_list = self._buckets[bucket]
-        if linked_list.contains(key):
-            linked_list.contains(key).value = value
-        else:
-            linked_list.insert(key, value)
+        if linked_list is None:
+            linked_list = LinkedList()
+            self._buckets[bucket] = linked_list
+            linked_list.insert(key, value, hash)
             self._size += 1
+            return True
+
+        # Replaces associated value if key exists, otherwise adds a new key/value pair
+        node = linked_list.contains(key, hash)
+        if node:
+            node.value = value
+            return False
+        linked_list.insert(key, value, hash)
+        self._size += 1
+        return True
 
     def empty_buckets(self) -> int:
         """
@@ -105,9 +143,10 @@ class HashMap:
         :return: integer of empty buckets
         """
         # Counts how many empty buckets are in the has table and returns that count
+        buckets = self._buckets
         count = 0
         for bucket in range(self._capacity):
-            if self._buckets[bucket].length() == 0:
+            if buckets[bucket] is None:
                 count += 1
         return count
 
@@ -128,13 +167,13 @@ class HashMap:
         """
         # Clears each bucket, leaving current capacity intact
         for bucket in range(self._capacity):
-            self._buckets[bucket] = LinkedList()
+            self._buckets[bucket] = None
         self._size = 0
 
     def resize_table(self, new_capacity: int) -> None:
         """
         Changes the capacity of the internal hash table. All existing key/value pairs must remain in the new hash map,
-        and all hash table links must be rehashed.
+        and all hash table links must be rebuilt from each node's stored hash.
 
         :param new_capacity: integer of capacity to be resized to
 
@@ -144,22 +183,35 @@ class HashMap:
         if new_capacity < 1:
             return
 
-        # Checks if given capacity is prime and finds the closest prime number if not
-        if not self._is_prime(new_capacity):
-            new_capacity = self._next_prime(new_capacity)
+        # Checks if given capacity is a power of two (a single bit set) and rounds it up to the closest one if not,
+        # so the doubling done by put never searches for a capacity
+        if new_capacity & (new_capacity - 1):
+            new_capacity = self._next_power_of_two(new_capacity)
 
-        # Gets the key/value pairs and clears the internal buckets
-        key_value_da = self.get_keys_and_values()
-        self.clear()
-        # Removes all buckets and adds the new correct amount of buckets
+        # Keeps the old buckets to relink their nodes from, and adds the new correct amount of buckets
+        old_buckets = self._buckets
+        old_capacity = self._capacity
         self._buckets = DynamicArray()
         for space in range(new_capacity):
-            self._buckets.append(LinkedList())
-        # Updates the capacity and rehashes existing key/value pairs in the hash map based on the new capacity
+            self._buckets.append(None)
+        # Updates the capacity and relinks the existing nodes straight into the new buckets, without collecting the
+        # key/value pairs first, allocating new nodes, or checking for keys that are already known to be distinct
         self._capacity = new_capacity
-        for pair in range(key_value_da.length()):
-            key, value = key_value_da[pair]
-            self.put(key, value)
+        self._mask = new_capacity - 1
+        # Nodes keep their key's hash, so no key is hashed again
+        buckets = self._buckets
+        for bucket in range(old_capacity):
+            old_list = old_buckets[bucket]
+            if old_list is None:
+                continue
+            # The iterator steps past each node before returning it, so the node can be relinked right away
+            for node in old_list:
+                new_bucket = node.hash & self._mask
+                linked_list = buckets[new_bucket]
+                if linked_list is None:
+                    linked_list = LinkedList()
+                    buckets[new_bucket] = linked_list
+                linked_list.insert_node(node)
 
     def get(self, key: str):
         """
@@ -169,16 +221,15 @@ class HashMap:
 
         :return: value associated with key
         """
-        # Returns None if key is not in the hash map
-        if not self.contains_key(key):
+        # Finds node with given key in a single pass and returns the associated value, or None if it is not there
+        hash = self._hash(key)
+        linked_list = self._buckets[hash & self._mask]
+        if linked_list is None:
             return None
-
-        # Finds node with given value and returns the associated value
-        bucket = self._hash_function(key) % self._capacity
-        linked_list = self._buckets[bucket]
-        for node in linked_list:
-            if node.key == key:
-                return node.value
+        node = linked_list.contains(key, hash)
+        if node:
+            return node.value
+        return None
 
     def contains_key(self, key: str) -> bool:
         """
@@ -193,8 +244,9 @@ class HashMap:
             return False
 
         # Checks bucket where given key would be and returns True if found or False if not
-        bucket = self._hash_function(key) % self._capacity
-        if self._buckets[bucket].contains(key):
+        hash = self._hash(key)
+        linked_list = self._buckets[hash & self._mask]
+        if linked_list is not None and linked_list.contains(key, hash):
             return True
         return False
 
@@ -206,15 +258,15 @@ class HashMap:
 
         :return: none
         """
-        # Does nothing if key is not in the hash map
-        if not self.contains_key(key):
-            return
-
-        # Finds key and removes it, then updates the hash map size
-        for bucket in range(self._capacity):
-            if self._buckets[bucket].contains(key):
-                self._buckets[bucket].remove(key)
-                self._size -= 1
+        # Removes key from the bucket it hashes to and updates the hash map size if it was there
+        hash = self._hash(key)
+        bucket = hash & self._mask
+        linked_list = self._buckets[bucket]
+        if linked_list is not None and linked_list.remove(key, hash):
+            self._size -= 1
+            # Releases the linked list once the bucket is empty again
+            if linked_list.length() == 0:
+                self._buckets[bucket] = None
 
     def get_keys_and_values(self) -> DynamicArray:
         """
@@ -223,11 +275,18 @@ class HashMap:
         :return: dynamic array with tuples of key/value pairs
         """
         # Creates a new dynamic array and adds each key/value pair in the hash map to it, then returns that array
+        # Skips empty buckets without building an iterator for them, and stops once every pair is found
         key_value_da = DynamicArray()
-        for bucket in range(self._capacity):
-            for node in self._buckets[bucket]:
-                value = node.key, node.value
-                key_value_da.append(value)
+        buckets = self._buckets
+        remaining = self._size
+        bucket = 0
+        while remaining > 0:
+            linked_list = buckets[bucket]
+            if linked_list is not None:
+                for node in linked_list:
+                    key_value_da.append((node.key, node.value))
+                remaining -= linked_list.length()
+            bucket += 1
         return key_value_da
 
 
@@ -241,32 +300,26 @@ def find_mode(da: DynamicArray) -> tuple[DynamicArray, int]:
     :return: tuple with dynamic array of mode values, and frequency
     ** endgame is like assignment 2
     """
-    # Creates a hash map instance and a new DynamicArray object to hold mode value(s)
-    map = HashMap()
+    # Creates a hash map sized for every element to be distinct, so it never resizes while counting,
+    # and a new DynamicArray object to hold mode value(s)
+    map = HashMap(da.length())
     mode_da = DynamicArray()
+    frequency = 0
 
-    # Finds frequency of each element of dynamic array and updates the hash map appropriately
+    # Counts each element in a single pass with one lookup and one update, tracking the mode value(s) as it goes
     for i in range(da.length()):
         value = da[i]
         # Uses dynamic array element as key and its frequency as value, updates value with occurrences
-        if map.contains_key(value):
-            map.put(value, map.get(value) + 1)
-        else:
-            map.put(value, 1)
-
-    # Finds maximum frequency
-    map_da = map.get_keys_and_values()
-    frequency = 0
-    for pair in range(map_da.length()):
-        key, value = map_da[pair]
-        frequency = max(frequency, value)
+        count = map.get(value)
+        count = 1 if count is None else count + 1
+        map.put(value, count)
 
-    # Finds values with the maximum frequency and adds to the dynamic array holding the mode value(s)
-    for pair in range(map_da.length()):
-        key, value = map_da[pair]
-        if value == frequency:
-            mode_da.append(key)
+        # Restarts the modes at a new maximum frequency and adds each element that reaches the current one
+        if count > frequency:
+            frequency = count
+            mode_da = DynamicArray()
+        if count == frequency:
+            mode_da.append(value)
 
     # Returns tuple with dynamic array of mode value(s), and frequency
     return mode_da, frequency
-  
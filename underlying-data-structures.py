@@ -1,5 +1,5 @@
 # Description: Provided data structures necessary to implement two forms of HashMap, 
-#              Separate Chaining(SC) and Open Addressing(OA) with Quadratic Probing.
+#              Separate Chaining(SC) and Open Addressing(OA) with Robin Hood Linear Probing.
 #              Includes two simple hash functions.
 
 
@@ -102,10 +102,14 @@ class SLNode:
     Singly Linked List node for use in a hash map
     """
 
-    def __init__(self, key: str, value: object, next: "SLNode" = None) -> None:
-        """Initialize node given a key and value."""
+    # Fixed attributes stored in slots rather than a per-node __dict__, shrinking each node
+    __slots__ = ('key', 'value', 'hash', 'next')
+
+    def __init__(self, key: str, value: object, hash: int, next: "SLNode" = None) -> None:
+        """Initialize node given a key, value and the key's hash."""
         self.key = key
         self.value = value
+        self.hash = hash
         self.next = next
 
     def __str__(self) -> str:
@@ -167,20 +171,26 @@ class LinkedList:
         """Return an iterator for the list, starting at the head."""
         return LinkedListIterator(self._head)
 
-    def insert(self, key: str, value: object) -> None:
+    def insert(self, key: str, value: object, hash: int) -> None:
         """Insert new node at front of the list."""
-        self._head = SLNode(key, value, self._head)
+        self._head = SLNode(key, value, hash, self._head)
+        self._size += 1
+
+    def insert_node(self, node: SLNode) -> None:
+        """Relink an existing node, such as one taken from another list, at front of the list."""
+        node.next = self._head
+        self._head = node
         self._size += 1
 
-    def remove(self, key: str) -> bool:
+    def remove(self, key: str, hash: int) -> bool:
         """
-        Remove first node with matching key.
+        Remove first node with matching key, comparing hashes before keys.
         Return True if removal was successful, False otherwise.
         """
         previous, node = None, self._head
         while node:
 
-            if node.key == key:
+            if node.hash == hash and node.key == key:
                 if previous:
                     previous.next = node.next
                 else:
@@ -191,11 +201,11 @@ class LinkedList:
             previous, node = node, node.next
         return False
 
-    def contains(self, key: str) -> SLNode:
-        """Return node with matching key, or None if no match"""
+    def contains(self, key: str, hash: int) -> SLNode:
+        """Return node with matching key, or None if no match. Compares hashes before keys."""
         node = self._head
         while node:
-            if node.key == key:
+            if node.hash == hash and node.key == key:
                 return node
             node = node.next
         return node
@@ -209,13 +219,20 @@ class LinkedList:
 
 class HashEntry:
 
-    def __init__(self, key: str, value: object) -> None:
-        """Initialize an entry for use in a hash map."""
+    # No per-instance __dict__, since open addressing creates one entry per stored key
+    __slots__ = ('key', 'value', 'hash', 'distance')
+
+    def __init__(self, key: str, value: object, hash: int, distance: int = 0) -> None:
+        """
+        Initialize an entry for use in a hash map.
+        Keeps the key's hash and its distance from its home bucket for Robin Hood probing.
+        """
         self.key = key
         self.value = value
 
-        self.is_tombstone = False
+        self.hash = hash
+        self.distance = distance
 
     def __str__(self) -> str:
         """Override string method to provide more readable output."""
-        return f"K: {self.key} V: {self.value} TS: {self.is_tombstone}"
+        return f"K: {self.key} V: {self.value} D: {self.distance}"